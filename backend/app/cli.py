@@ -0,0 +1,426 @@
+"""
+Offline bulk analysis of resumes against job descriptions
+
+Usage (from the backend directory):
+    python -m app.cli --resumes resumes/ --jds jds/ --output results.jsonl
+    python -m app.cli --manifest pairs.jsonl --output results.parquet --format parquet
+
+A manifest is JSONL with one pair per line:
+    {"resume": "path/to/resume.pdf", "job_description": "path/to/jd.txt", "id": "optional"}
+
+Without "id", the pair_id is built from both paths relative to the manifest
+directory. pair_ids must be unique.
+
+Completed pairs are recorded in a checkpoint file, so an interrupted run
+can be restarted with the same arguments and skips finished work. On
+restart, output rows of pairs missing from the checkpoint (failed or cut
+off by the interruption) are removed before they are retried, so the
+output holds one row per pair_id. Parquet output is written as one file
+per batch: ``--output results.parquet`` produces ``results.partNNNNN.parquet``.
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import logging
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from dotenv import load_dotenv
+
+from app.models.schemas import AnalyzeResponse
+from app.services.parser_service import ParserService
+from app.services.gemini_service import AIService, ai_service
+from app.utils.logging_config import setup_logging, setup_worker_logging
+from app.utils.serialization import validate
+
+logger = logging.getLogger("app.cli")
+
+SUPPORTED_EXTENSIONS = {".pdf", ".docx", ".txt"}
+
+_worker = threading.local()
+
+
+@dataclass(frozen=True)
+class Pair:
+    """One resume / job description combination to analyze"""
+    pair_id: str
+    resume: Path
+    job_description: Path
+
+
+def parse_document(path: str) -> Tuple[str, str, Optional[str]]:
+    """
+    Extract and clean text from a file (runs in a worker process)
+
+    Returns:
+        Tuple of (path, text, error)
+    """
+    try:
+        content = Path(path).read_bytes()
+        file_type = Path(path).suffix.lower().lstrip(".")
+        if file_type == "pdf":
+            text = ParserService.parse_pdf(content)
+        elif file_type == "docx":
+            text = ParserService.parse_docx(content)
+        else:
+            text = ParserService.parse_txt(content)
+        return path, ParserService.clean_text(text), None
+    except Exception as e:
+        return path, "", f"{type(e).__name__}: {e}"
+
+
+def _list_documents(directory: Path) -> List[Path]:
+    return sorted(
+        p for p in directory.iterdir()
+        if p.is_file() and p.suffix.lower() in SUPPORTED_EXTENSIONS
+    )
+
+
+def _relative_id(path: Path, base: Path) -> str:
+    """Path relative to the manifest directory, so same-named files in different folders don't collide"""
+    return Path(os.path.relpath(path, base.resolve())).as_posix()
+
+
+def load_pairs(args: argparse.Namespace) -> List[Pair]:
+    """Build the list of pairs from a manifest or the resumes x JDs cross product"""
+    if args.manifest:
+        manifest = Path(args.manifest)
+        pairs: List[Pair] = []
+        with manifest.open(encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                resume = (manifest.parent / entry["resume"]).resolve()
+                jd = (manifest.parent / entry["job_description"]).resolve()
+                pair_id = entry.get("id") or (
+                    f"{_relative_id(resume, manifest.parent)}::{_relative_id(jd, manifest.parent)}"
+                )
+                pairs.append(Pair(pair_id, resume, jd))
+    else:
+        resumes = _list_documents(Path(args.resumes))
+        jds = _list_documents(Path(args.jds))
+        pairs = [
+            Pair(f"{resume.name}::{jd.name}", resume, jd)
+            for resume in resumes
+            for jd in jds
+        ]
+
+    # pair_id keys the checkpoint and the output rows, so it must be unique
+    counts = Counter(pair.pair_id for pair in pairs)
+    duplicates = sorted(pair_id for pair_id, count in counts.items() if count > 1)
+    if duplicates:
+        raise ValueError(f"Duplicate pair ids: {', '.join(duplicates)}")
+    return pairs
+
+
+def load_checkpoint(path: Path) -> Set[str]:
+    """Read IDs of pairs completed by previous runs"""
+    if not path.exists():
+        return set()
+    with path.open(encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+def _parquet_schema():
+    """Explicit schema so batches of only failed pairs don't infer null columns"""
+    import pyarrow as pa
+
+    return pa.schema([
+        ("pair_id", pa.string()),
+        ("resume", pa.string()),
+        ("job_description", pa.string()),
+        ("status", pa.string()),
+        ("error", pa.string()),
+        ("model_used", pa.string()),
+        ("ats_score", pa.int64()),
+        ("keyword_match_rate", pa.int64()),
+        ("result", pa.string()),
+    ])
+
+
+class ResultWriter:
+    """
+    Stream result records to JSONL or Parquet, checkpointing completed pairs
+
+    A pair is only added to the checkpoint after its row is durably in the
+    output: JSONL rows are flushed line by line, Parquet rows are written
+    as one complete part file per batch (``<stem>.partNNNNN.parquet``).
+    Failed pairs are written but never checkpointed, so the next run
+    retries them; ``compact()`` first drops such rows (and rows written
+    just before a crash) so the output ends up with one row per pair_id.
+    """
+
+    PARQUET_BATCH_SIZE = 100
+
+    def __init__(self, output: Path, fmt: str, checkpoint_path: Path):
+        self.fmt = fmt
+        self.output = output
+        self.checkpoint_path = checkpoint_path
+        self._buffer: List[Dict] = []
+        self._buffer_done: List[str] = []
+        self._file = None
+        self._checkpoint = None
+
+    def _parts(self) -> List[Path]:
+        return sorted(self.output.parent.glob(f"{self.output.stem}.part*{self.output.suffix}"))
+
+    def compact(self, completed: Set[str]) -> None:
+        """Keep only rows of pairs recorded in the checkpoint"""
+        if self.fmt == "jsonl":
+            if not self.output.exists():
+                return
+            kept: Dict[str, str] = {}
+            with self.output.open(encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    pair_id = json.loads(line)["pair_id"]
+                    if pair_id in completed:
+                        kept[pair_id] = line if line.endswith("\n") else line + "\n"
+            tmp = self.output.with_name(self.output.name + ".tmp")
+            tmp.write_text("".join(kept.values()), encoding="utf-8")
+            tmp.replace(self.output)
+            return
+
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+
+        completed_ids = pa.array(sorted(completed), type=pa.string())
+        for part in self._parts():
+            table = pq.read_table(str(part))
+            mask = pc.is_in(table["pair_id"], value_set=completed_ids)
+            filtered = table.filter(mask)
+            if filtered.num_rows == table.num_rows:
+                continue
+            if filtered.num_rows == 0:
+                part.unlink()
+            else:
+                tmp = part.with_name(part.name + ".tmp")
+                pq.write_table(filtered, str(tmp))
+                tmp.replace(part)
+
+    def describe(self) -> str:
+        if self.fmt == "jsonl":
+            return str(self.output)
+        return str(self.output.with_name(f"{self.output.stem}.part*{self.output.suffix}"))
+
+    def open(self) -> "ResultWriter":
+        self._checkpoint = self.checkpoint_path.open("a", encoding="utf-8")
+        if self.fmt == "jsonl":
+            self._file = self.output.open("a", encoding="utf-8")
+        return self
+
+    def _mark_done(self, pair_ids: List[str]) -> None:
+        if pair_ids:
+            self._checkpoint.write("".join(pair_id + "\n" for pair_id in pair_ids))
+            self._checkpoint.flush()
+
+    def write(self, record: Dict, done: bool) -> None:
+        """Write a record; ``done`` pairs are checkpointed once the row is on disk"""
+        if self.fmt == "jsonl":
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._file.flush()
+            self._mark_done([record["pair_id"]] if done else [])
+            return
+        row = dict(record)
+        row["result"] = json.dumps(row["result"], ensure_ascii=False) if row["result"] else None
+        self._buffer.append(row)
+        if done:
+            self._buffer_done.append(record["pair_id"])
+        if len(self._buffer) >= self.PARQUET_BATCH_SIZE:
+            self._flush_parquet()
+
+    def _flush_parquet(self) -> None:
+        if not self._buffer:
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        parts = self._parts()
+        next_index = int(parts[-1].stem.rsplit(".part", 1)[1]) + 1 if parts else 0
+        part = self.output.with_name(f"{self.output.stem}.part{next_index:05d}{self.output.suffix}")
+        tmp = part.with_name(part.name + ".tmp")
+        pq.write_table(pa.Table.from_pylist(self._buffer, schema=_parquet_schema()), str(tmp))
+        tmp.replace(part)
+        self._mark_done(self._buffer_done)
+        self._buffer = []
+        self._buffer_done = []
+
+    def close(self) -> None:
+        if self.fmt == "jsonl":
+            if self._file is not None:
+                self._file.close()
+        else:
+            self._flush_parquet()
+        if self._checkpoint is not None:
+            self._checkpoint.close()
+
+
+def _analyze_blocking(resume_text: str, job_description: str) -> Tuple[Dict, str]:
+    """
+    Run one analysis on a private event loop in a worker thread
+
+    The provider SDK calls block, so overlapping them needs threads. Each
+    thread gets its own AIService (provider clients are lazily built and
+    not shared); the retry budget and stats stay global via the shared
+    RetryExecutor, which is thread-safe.
+    """
+    service = getattr(_worker, "ai_service", None)
+    if service is None:
+        service = _worker.ai_service = AIService(retries=ai_service.retries)
+    return asyncio.run(service.analyze(resume_text, job_description))
+
+
+async def run(args: argparse.Namespace, pairs: List[Pair]) -> int:
+    output = Path(args.output)
+    checkpoint_path = Path(args.checkpoint) if args.checkpoint else output.with_name(output.name + ".checkpoint")
+    completed = load_checkpoint(checkpoint_path)
+    writer = ResultWriter(output, args.format, checkpoint_path)
+    # Drop rows of failed or un-checkpointed pairs from earlier runs; they are redone below
+    writer.compact(completed)
+    pending = [pair for pair in pairs if pair.pair_id not in completed]
+    logger.info(
+        "%s pairs total, %s already completed, %s to run",
+        len(pairs), len(pairs) - len(pending), len(pending)
+    )
+    if not pending:
+        return 0
+
+    started = time.perf_counter()
+
+    # Parse every document needed by the pending pairs in a process pool
+    paths = sorted({str(p.resume) for p in pending} | {str(p.job_description) for p in pending})
+    loop = asyncio.get_running_loop()
+    texts: Dict[str, str] = {}
+    parse_errors: Dict[str, str] = {}
+    # Forked workers inherit the logging queue but not its listener thread
+    with ProcessPoolExecutor(max_workers=args.parse_workers, initializer=setup_worker_logging) as pool:
+        for path, text, error in await asyncio.gather(
+            *(loop.run_in_executor(pool, parse_document, path) for path in paths)
+        ):
+            if error:
+                parse_errors[path] = error
+            else:
+                texts[path] = text
+    parse_seconds = time.perf_counter() - started
+    logger.info("Parsed %s documents in %.2fs (%s failed)", len(paths), parse_seconds, len(parse_errors))
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    counts = {"ok": 0, "error": 0}
+    writer.open()
+
+    async def process(pair: Pair) -> None:
+        record = {
+            "pair_id": pair.pair_id,
+            "resume": str(pair.resume),
+            "job_description": str(pair.job_description),
+            "status": "ok",
+            "error": None,
+            "model_used": None,
+            "ats_score": None,
+            "keyword_match_rate": None,
+            "result": None,
+        }
+        error = parse_errors.get(str(pair.resume)) or parse_errors.get(str(pair.job_description))
+        resume_text = texts.get(str(pair.resume), "")
+        if not error and len(resume_text) < 50:
+            error = "Could not extract sufficient text from the resume"
+
+        if not error:
+            async with semaphore:
+                try:
+                    analysis_result, model_used = await asyncio.to_thread(
+                        _analyze_blocking,
+                        resume_text,
+                        texts[str(pair.job_description)]
+                    )
+                    response = validate(AnalyzeResponse, {
+                        "ats_score": analysis_result.get("ats_score", 0),
+                        "keyword_match_rate": analysis_result.get("keyword_match_rate", 0),
+                        "analysis": analysis_result.get("analysis", {}),
+                        "skill_roadmap": analysis_result.get("skill_roadmap", {}),
+                        "recommendations": analysis_result.get("recommendations", []),
+                        "model_used": model_used,
+                    })
+                    record.update(
+                        model_used=model_used,
+                        ats_score=response.ats_score,
+                        keyword_match_rate=response.keyword_match_rate,
+                        result=response.model_dump(mode="json", exclude={"analysis_id"}),
+                    )
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+
+        if error:
+            record.update(status="error", error=error)
+            counts["error"] += 1
+            logger.warning("Pair %s failed: %s", pair.pair_id, error)
+        else:
+            counts["ok"] += 1
+
+        # Only successful pairs are checkpointed; failures are retried next run
+        writer.write(record, done=not error)
+
+    try:
+        await asyncio.gather(*(process(pair) for pair in pending))
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - started
+    processed = counts["ok"] + counts["error"]
+    print(
+        f"Processed {processed} pairs in {elapsed:.1f}s "
+        f"({processed / elapsed:.2f} pairs/s; parse {parse_seconds:.1f}s) - "
+        f"{counts['ok']} ok, {counts['error']} failed, "
+        f"{len(pairs) - len(pending)} skipped from checkpoint. Output: {writer.describe()}"
+    )
+    return 1 if counts["error"] else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.cli",
+        description="Bulk-analyze resumes against job descriptions"
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--manifest", help="JSONL manifest of resume/job_description pairs")
+    source.add_argument("--resumes", help="Directory of resumes (analyzed against every JD in --jds)")
+    parser.add_argument("--jds", help="Directory of job descriptions (with --resumes)")
+    parser.add_argument("--output", required=True, help="Output file (Parquet: base name of the part files)")
+    parser.add_argument("--format", choices=["jsonl", "parquet"], default="jsonl")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <output>.checkpoint)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent AI analyses")
+    parser.add_argument("--parse-workers", type=int, default=os.cpu_count(), help="Parser processes")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    load_dotenv()
+    setup_logging()
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.resumes and not args.jds:
+        parser.error("--jds is required with --resumes")
+    if args.format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            parser.error("Parquet output requires pyarrow (pip install pyarrow)")
+    try:
+        pairs = load_pairs(args)
+    except ValueError as e:
+        parser.error(str(e))
+    return asyncio.run(run(args, pairs))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,26 +2,45 @@
 SkillBridge API - FastAPI Application
 """
 import os
+import time
+import uuid
 import logging
+import threading
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+from app.utils.logging_config import (
+    setup_logging,
+    shutdown_logging,
+    start_request,
+    get_stage_durations,
+    request_id_var,
 )
+from app.utils.serialization import default_response_class, add_compression
+from app.utils.profiling import (
+    PROFILING_AVAILABLE,
+    SamplingProfiler,
+    ProfilerBusyError,
+    profile_store,
+    is_authorized,
+    track_request,
+)
+
+# Configure logging (queue-based, emitted off the event loop thread)
+setup_logging()
 logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager"""
+    # No-op on first startup; restarts the listener if a previous lifespan stopped it
+    setup_logging()
     logger.info("Starting SkillBridge API...")
     
     # Check for API keys
@@ -44,6 +63,7 @@ async def lifespan(app: FastAPI):
     yield
     
     logger.info("Shutting down SkillBridge API...")
+    shutdown_logging()
 
 
 # Create FastAPI app
@@ -52,6 +72,7 @@ app = FastAPI(
     description="AI-Powered ATS Resume Analyzer with Skill Development Roadmaps",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=default_response_class(),
 )
 
 # Configure CORS
@@ -66,11 +87,86 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Location", "X-Request-ID", "X-Profile-Id", "X-Profile-Overlap", "X-Profile-Skipped"],
 )
 
+# Optional gzip/brotli compression for large roadmaps
+add_compression(app)
+
+
+async def profile_request(request: Request, call_next):
+    """Profile a single /api/analyze request when asked via the X-Profile header"""
+    with track_request():
+        if (
+            request.url.path != "/api/analyze"
+            or not request.headers.get("X-Profile")
+            or not is_authorized(request.headers.get("X-Profile-Token"))
+        ):
+            return await call_next(request)
+        
+        # Parsing, prompt build and provider calls all run on the event loop
+        # thread; concurrent requests on it are sampled too and counted as overlap
+        request_id = request_id_var.get()
+        profiler = SamplingProfiler(
+            thread_id=threading.get_ident(),
+            label=f"request {request_id}",
+        )
+        try:
+            profiler.start()
+        except ProfilerBusyError:
+            response = await call_next(request)
+            response.headers["X-Profile-Skipped"] = "busy"
+            return response
+        try:
+            response = await call_next(request)
+        finally:
+            profiler.stop()
+    
+    profile_id = uuid.uuid4().hex
+    profile_store.put(profile_id, profiler.collapsed())
+    response.headers["X-Profile-Id"] = profile_id
+    response.headers["X-Profile-Overlap"] = str(profiler.overlapping_requests)
+    logger.info(
+        "Stored request profile %s for %s (%.3fs, %s overlapping requests)",
+        profile_id, request_id, profiler.duration, profiler.overlapping_requests
+    )
+    return response
+
+
+# Only pay for request tracking when profiling is enabled and token-protected
+if PROFILING_AVAILABLE:
+    app.middleware("http")(profile_request)
+
+
+@app.middleware("http")
+async def request_context(request: Request, call_next):
+    """Assign a request ID and log a single timing summary per request"""
+    request_id = start_request(request.headers.get("X-Request-ID"))
+    start = time.perf_counter()
+    response = await call_next(request)
+    durations = get_stage_durations()
+    durations["total"] = round((time.perf_counter() - start) * 1000, 2)
+    response.headers["X-Request-ID"] = request_id
+    logger.info(
+        "%s %s -> %s",
+        request.method,
+        request.url.path,
+        response.status_code,
+        extra={
+            "method": request.method,
+            "path": request.url.path,
+            "status_code": response.status_code,
+            "durations_ms": durations,
+        },
+    )
+    return response
+
+
 # Import and include routes
 from app.routes.analyze import router as analyze_router
 app.include_router(analyze_router)
+from app.routes.profiling import router as profiling_router
+app.include_router(profiling_router)
 
 
 @app.get("/")
@@ -82,6 +178,7 @@ async def root():
         "description": "AI-Powered ATS Resume Analyzer",
         "endpoints": {
             "analyze": "POST /api/analyze",
+            "analysis": "GET /api/analyses/{id}",
             "health": "GET /api/health"
         }
     }
@@ -60,6 +60,7 @@ class AnalyzeResponse(BaseModel):
     skill_roadmap: SkillRoadmap
     recommendations: List[str] = []
     model_used: str = "gemini"  # Track which AI model was used
+    analysis_id: Optional[str] = None  # Content-derived ID for GET /api/analyses/{id}
 
 
 class ErrorResponse(BaseModel):
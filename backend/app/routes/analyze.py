@@ -1,11 +1,15 @@
 """
 API routes for resume analysis
 """
-from fastapi import APIRouter, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Header, Response, status
 from app.models.schemas import AnalyzeRequest, AnalyzeResponse, ErrorResponse
 from app.services.parser_service import ParserService
 from app.services.gemini_service import ai_service
+from app.services.analysis_store import analysis_store, etag_matches, ANALYSIS_CACHE_CONTROL
 from app.utils.validators import validate_request, ValidationError
+from app.utils.logging_config import timed_stage
+from app.utils.serialization import validate, dump_json, RawJSONResponse, FAST_SERIALIZATION
 import logging
 
 logger = logging.getLogger(__name__)
@@ -21,7 +25,7 @@ router = APIRouter(prefix="/api", tags=["analysis"])
         500: {"model": ErrorResponse, "description": "Server error"},
     }
 )
-async def analyze_resume(request: AnalyzeRequest):
+async def analyze_resume(request: AnalyzeRequest, http_response: Response):
     """
     Analyze a resume against a job description
     
@@ -44,10 +48,11 @@ async def analyze_resume(request: AnalyzeRequest):
             )
         
         # Parse document
-        logger.info(f"Parsing {request.file_type} document")
+        logger.info("Parsing %s document", request.file_type)
         try:
-            resume_text = ParserService.parse(request.resume, request.file_type)
-            resume_text = ParserService.clean_text(resume_text)
+            with timed_stage("parse"):
+                resume_text = ParserService.parse(request.resume, request.file_type)
+                resume_text = ParserService.clean_text(resume_text)
         except ValueError as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -63,33 +68,55 @@ async def analyze_resume(request: AnalyzeRequest):
         # Analyze with AI
         logger.info("Starting AI analysis")
         try:
-            analysis_result, model_used = await ai_service.analyze(
-                resume_text,
-                request.job_description
-            )
+            with timed_stage("ai_analysis"):
+                analysis_result, model_used = await ai_service.analyze(
+                    resume_text,
+                    request.job_description
+                )
         except ValueError as e:
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail=str(e)
             )
         except Exception as e:
-            logger.error(f"AI analysis failed: {e}")
+            logger.error("AI analysis failed: %s", e)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="AI analysis failed. Please try again later."
             )
         
-        # Build response
-        response = AnalyzeResponse(
-            ats_score=analysis_result.get("ats_score", 0),
-            keyword_match_rate=analysis_result.get("keyword_match_rate", 0),
-            analysis=analysis_result.get("analysis", {}),
-            skill_roadmap=analysis_result.get("skill_roadmap", {}),
-            recommendations=analysis_result.get("recommendations", []),
-            model_used=model_used
+        # Build response (single validation pass via cached TypeAdapter)
+        response = validate(AnalyzeResponse, {
+            "ats_score": analysis_result.get("ats_score", 0),
+            "keyword_match_rate": analysis_result.get("keyword_match_rate", 0),
+            "analysis": analysis_result.get("analysis", {}),
+            "skill_roadmap": analysis_result.get("skill_roadmap", {}),
+            "recommendations": analysis_result.get("recommendations", []),
+            "model_used": model_used,
+        })
+        
+        # Store under a content-derived ID so repeat views can be served by GET;
+        # the ID is hashed from and spliced into a single dump
+        analysis_id, body = analysis_store.attach_id(dump_json(AnalyzeResponse, response))
+        response.analysis_id = analysis_id
+        stored = await analysis_store.put(analysis_id, body)
+        headers = {
+            "Location": f"/api/analyses/{stored.analysis_id}",
+            "ETag": stored.etag,
+        }
+        
+        logger.info(
+            "Analysis complete. ATS Score: %s, Model: %s",
+            response.ats_score,
+            model_used,
+            extra={"ats_score": response.ats_score, "model_used": model_used},
         )
         
-        logger.info(f"Analysis complete. ATS Score: {response.ats_score}, Model: {model_used}")
+        if FAST_SERIALIZATION:
+            # Already validated and serialized; skip FastAPI's response_model pass
+            return RawJSONResponse(content=stored.body, headers=headers)
+        
+        http_response.headers.update(headers)
         return response
         
     except HTTPException:
@@ -102,6 +129,47 @@ async def analyze_resume(request: AnalyzeRequest):
         )
 
 
+@router.get(
+    "/analyses/{analysis_id}",
+    response_model=AnalyzeResponse,
+    responses={
+        304: {"description": "Not modified"},
+        404: {"model": ErrorResponse, "description": "Analysis not found"},
+    }
+)
+async def get_analysis(
+    analysis_id: str,
+    if_none_match: Optional[str] = Header(default=None)
+):
+    """
+    Fetch a previously completed analysis
+    
+    Supports conditional requests via **If-None-Match**; the ETag never
+    changes for a given ID.
+    """
+    stored = await analysis_store.get(analysis_id)
+    if stored is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Analysis not found. It may have expired; please analyze the resume again."
+        )
+    
+    headers = {
+        "ETag": stored.etag,
+        "Cache-Control": ANALYSIS_CACHE_CONTROL,
+    }
+    if etag_matches(if_none_match, stored.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    return RawJSONResponse(content=stored.body, headers=headers)
+
+
+@router.get("/providers/retries")
+async def provider_retry_stats():
+    """Retry counts and reasons per AI provider"""
+    return ai_service.retries.get_stats()
+
+
 @router.get("/health")
 async def health_check():
     """Health check endpoint"""
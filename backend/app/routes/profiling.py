@@ -0,0 +1,76 @@
+"""
+API routes for on-demand profiling
+(disabled unless PROFILING_ENABLED=true and PROFILING_TOKEN is set)
+"""
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Header, Query, status
+from fastapi.responses import PlainTextResponse
+from app.utils.profiling import (
+    SamplingProfiler,
+    ProfilerBusyError,
+    profile_store,
+    is_authorized,
+    PROFILING_AVAILABLE,
+    PROFILING_MAX_SECONDS,
+)
+
+router = APIRouter(prefix="/api/debug", tags=["profiling"])
+
+
+def require_profiling_access(token: Optional[str]) -> None:
+    """Hide the endpoints when profiling is off; reject bad tokens otherwise"""
+    if not PROFILING_AVAILABLE:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not is_authorized(token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid or missing X-Profile-Token"
+        )
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+async def get_profile(
+    profile_id: str,
+    x_profile_token: Optional[str] = Header(default=None)
+):
+    """
+    Fetch the profile of a request sent with the **X-Profile** header
+
+    Returned in collapsed-stack format (flamegraph.pl, speedscope). The
+    event loop thread is sampled, so requests that overlapped the profiled
+    one (see X-Profile-Overlap on that response) appear in it too.
+    """
+    require_profiling_access(x_profile_token)
+    collapsed = profile_store.get(profile_id)
+    if collapsed is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return PlainTextResponse(collapsed)
+
+
+@router.post("/profile", response_class=PlainTextResponse)
+async def profile_worker(
+    seconds: float = Query(default=10, gt=0),
+    x_profile_token: Optional[str] = Header(default=None)
+):
+    """
+    Sample every thread of this worker for **seconds** and return the
+    collapsed stacks. Only one profile runs at a time (409 otherwise).
+    """
+    require_profiling_access(x_profile_token)
+    seconds = min(seconds, PROFILING_MAX_SECONDS)
+
+    profiler = SamplingProfiler()
+    try:
+        profiler.start()
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profiler.stop()
+
+    return PlainTextResponse(
+        profiler.collapsed(),
+        headers={"X-Profile-Duration": f"{profiler.duration:.3f}"}
+    )
@@ -0,0 +1,180 @@
+"""
+Store for completed analyses, keyed by a content-derived ID
+"""
+import os
+import re
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple
+
+from app.utils.serialization import RESPONSE_COMPRESSION
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+ANALYSIS_STORE_MAX_ENTRIES = int(os.getenv("ANALYSIS_STORE_MAX_ENTRIES", 1000))
+ANALYSIS_STORE_REDIS_URL = os.getenv("ANALYSIS_STORE_REDIS_URL", "")  # Shared store across instances
+ANALYSIS_STORE_DIR = os.getenv("ANALYSIS_STORE_DIR", "")  # Shared store across workers on one host
+ANALYSIS_STORE_TTL = int(os.getenv("ANALYSIS_STORE_TTL", 7 * 24 * 3600))  # Seconds, Redis only
+# Analyses contain personal resume data; set to "public, ..." only if a CDN should cache them
+ANALYSIS_CACHE_CONTROL = os.getenv(
+    "ANALYSIS_CACHE_CONTROL",
+    "private, max-age=86400, immutable"
+)
+
+_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+# AnalyzeResponse declares analysis_id last, so an un-stored dump ends with this
+_UNSET_ID_SUFFIX = b'"analysis_id":null}'
+
+
+@dataclass(frozen=True)
+class StoredAnalysis:
+    """Serialized analysis ready to be served as-is"""
+    analysis_id: str
+    body: bytes
+    etag: str
+
+
+class RedisBackend:
+    """Shared backend on Redis (or a Redis-compatible KV such as Vercel KV / Upstash)"""
+
+    def __init__(self, url: str, ttl: int = ANALYSIS_STORE_TTL):
+        import redis
+        self._client = redis.Redis.from_url(url)
+        self.ttl = ttl
+
+    def get(self, analysis_id: str) -> Optional[bytes]:
+        return self._client.get(f"analysis:{analysis_id}")
+
+    def put(self, analysis_id: str, body: bytes) -> None:
+        self._client.set(f"analysis:{analysis_id}", body, ex=self.ttl)
+
+
+class FileBackend:
+    """Shared backend on a directory (e.g. a volume mounted by every worker)"""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def get(self, analysis_id: str) -> Optional[bytes]:
+        try:
+            return (self.directory / f"{analysis_id}.json").read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def put(self, analysis_id: str, body: bytes) -> None:
+        path = self.directory / f"{analysis_id}.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(body)
+        tmp.replace(path)
+
+
+def _default_backend():
+    if ANALYSIS_STORE_REDIS_URL:
+        return RedisBackend(ANALYSIS_STORE_REDIS_URL)
+    if ANALYSIS_STORE_DIR:
+        return FileBackend(ANALYSIS_STORE_DIR)
+    return None
+
+
+class AnalysisStore:
+    """
+    Bounded in-process LRU in front of an optional shared backend
+
+    IDs are derived from the analysis content, so a stored resource never
+    changes. Without a shared backend each process only sees its own
+    analyses, so GET may 404 on another worker or serverless instance.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = ANALYSIS_STORE_MAX_ENTRIES,
+        backend=None,
+        weak_etags: bool = RESPONSE_COMPRESSION != "none",
+    ):
+        self.max_entries = max_entries
+        self.backend = backend
+        # gzip/br bodies differ byte-wise from the identity body, so a strong
+        # validator can't be shared across content-codings (RFC 9110 8.8.1)
+        self.weak_etags = weak_etags
+        self._entries: "OrderedDict[str, StoredAnalysis]" = OrderedDict()
+
+    @staticmethod
+    def compute_id(content: bytes) -> str:
+        """Derive a stable ID from the serialized form of an analysis"""
+        return hashlib.sha256(content).hexdigest()[:32]
+
+    @classmethod
+    def attach_id(cls, body: bytes) -> Tuple[str, bytes]:
+        """
+        Derive the ID of a serialized analysis and write it into the body
+
+        ``body`` must be dumped with ``analysis_id`` unset; the ID is spliced
+        into those bytes so the response is serialized only once.
+
+        Returns:
+            Tuple of (analysis_id, body_with_id)
+        """
+        if not body.endswith(_UNSET_ID_SUFFIX):
+            raise ValueError("Analysis body must end with an unset analysis_id")
+        analysis_id = cls.compute_id(body)
+        return analysis_id, body[:-len(b"null}")] + f'"{analysis_id}"}}'.encode("ascii")
+
+    def _remember(self, analysis_id: str, body: bytes) -> StoredAnalysis:
+        entry = StoredAnalysis(
+            analysis_id=analysis_id,
+            body=body,
+            etag=f'W/"{analysis_id}"' if self.weak_etags else f'"{analysis_id}"',
+        )
+        self._entries[analysis_id] = entry
+        self._entries.move_to_end(analysis_id)
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            logger.debug("Evicted analysis %s from store", evicted)
+        return entry
+
+    async def put(self, analysis_id: str, body: bytes) -> StoredAnalysis:
+        """Store a serialized analysis and return its entry"""
+        entry = self._remember(analysis_id, body)
+        if self.backend is not None:
+            try:
+                await asyncio.to_thread(self.backend.put, analysis_id, body)
+            except Exception as e:
+                logger.warning("Could not write analysis %s to shared store: %s", analysis_id, e)
+        return entry
+
+    async def get(self, analysis_id: str) -> Optional[StoredAnalysis]:
+        """Look up an analysis by ID, falling back to the shared backend"""
+        if not _ID_PATTERN.match(analysis_id):
+            return None
+        entry = self._entries.get(analysis_id)
+        if entry is not None:
+            self._entries.move_to_end(analysis_id)
+            return entry
+        if self.backend is None:
+            return None
+        try:
+            body = await asyncio.to_thread(self.backend.get, analysis_id)
+        except Exception as e:
+            logger.warning("Could not read analysis %s from shared store: %s", analysis_id, e)
+            return None
+        return self._remember(analysis_id, body) if body is not None else None
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Evaluate an If-None-Match header against an ETag (weak comparison per RFC 9110)"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    if "*" in candidates:
+        return True
+    return any(tag.removeprefix("W/") == etag.removeprefix("W/") for tag in candidates)
+
+
+# Singleton instance
+analysis_store = AnalysisStore(backend=_default_backend())
@@ -6,6 +6,7 @@ import json
 import logging
 from typing import Dict, Any, Optional
 import re
+from app.services.retry_policy import RetryExecutor, MalformedOutputError, ErrorClass
 
 logger = logging.getLogger(__name__)
 
@@ -84,6 +85,25 @@ IMPORTANT GUIDELINES:
 Respond ONLY with the JSON object, no additional text or markdown formatting."""
 
 
+class _NoRetryGenerativeClient:
+    """
+    Generative client proxy that disables the SDK's built-in retry
+
+    The transport retries ServiceUnavailable for up to 60s with time.sleep,
+    outside the retry budget; AIService's RetryExecutor is the only retry layer.
+    """
+    
+    def __init__(self, client):
+        self._client = client
+    
+    def generate_content(self, request, **kwargs):
+        kwargs["retry"] = None
+        return self._client.generate_content(request, **kwargs)
+    
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
 class GeminiService:
     """Primary AI service using Google Gemini"""
     
@@ -111,6 +131,8 @@ class GeminiService:
                     "top_p": 0.95,
                 }
             )
+            from google.generativeai.client import get_default_generative_client
+            self._model._client = _NoRetryGenerativeClient(get_default_generative_client())
         return self._model
     
     def is_available(self) -> bool:
@@ -127,7 +149,7 @@ class GeminiService:
             response = self.model.generate_content(prompt)
             return self._parse_response(response.text)
         except Exception as e:
-            logger.error(f"Gemini API error: {e}")
+            logger.error("Gemini API error: %s", e)
             raise
     
     def _parse_response(self, text: str) -> Dict[str, Any]:
@@ -141,9 +163,9 @@ class GeminiService:
         try:
             return json.loads(text)
         except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse AI response: {e}")
-            logger.debug(f"Response text: {text[:500]}")
-            raise ValueError("Failed to parse AI response as JSON")
+            logger.error("Failed to parse AI response: %s", e)
+            logger.debug("Response text: %s", text[:500])
+            raise MalformedOutputError("Failed to parse AI response as JSON")
 
 
 class GroqService:
@@ -161,7 +183,8 @@ class GroqService:
     def client(self):
         if self._client is None:
             from groq import Groq
-            self._client = Groq(api_key=self.api_key)
+            # AIService's RetryExecutor is the only retry layer (and budget)
+            self._client = Groq(api_key=self.api_key, max_retries=0)
         return self._client
     
     def is_available(self) -> bool:
@@ -192,7 +215,7 @@ class GroqService:
             )
             return self._parse_response(response.choices[0].message.content)
         except Exception as e:
-            logger.error(f"Groq API error: {e}")
+            logger.error("Groq API error: %s", e)
             raise
     
     def _parse_response(self, text: str) -> Dict[str, Any]:
@@ -205,8 +228,8 @@ class GroqService:
         try:
             return json.loads(text)
         except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse Groq response: {e}")
-            raise ValueError("Failed to parse AI response as JSON")
+            logger.error("Failed to parse Groq response: %s", e)
+            raise MalformedOutputError("Failed to parse AI response as JSON")
 
 
 class AIService:
@@ -214,11 +237,15 @@ class AIService:
     Unified AI service with automatic fallback
     Primary: Gemini
     Fallback: Groq (Llama 3.3 70B)
+    
+    Each provider call is retried according to the class of error it
+    raised (see retry_policy) before falling back to the next provider.
     """
     
-    def __init__(self):
+    def __init__(self, retries: Optional[RetryExecutor] = None):
         self.gemini = GeminiService()
         self.groq = GroqService()
+        self.retries = retries or RetryExecutor()
     
     async def analyze(self, resume_text: str, job_description: str) -> tuple[Dict[str, Any], str]:
         """
@@ -230,19 +257,27 @@ class AIService:
         # Debug log API key availability
         gemini_available = self.gemini.is_available()
         groq_available = self.groq.is_available()
-        logger.info(f"API key status - Gemini: {gemini_available}, Groq: {groq_available}")
+        logger.info("API key status - Gemini: %s, Groq: %s", gemini_available, groq_available)
         
         if not gemini_available and not groq_available:
             raise ValueError("No AI service available. Please configure GEMINI_API_KEY or GROQ_API_KEY in your .env file.")
         
+        self.retries.record_request()
+        
         # Try Gemini first
         if gemini_available:
             try:
                 logger.info("Attempting analysis with Gemini")
-                result = await self.gemini.analyze(resume_text, job_description)
+                result = await self.retries.call(
+                    "gemini",
+                    lambda: self.gemini.analyze(resume_text, job_description)
+                )
                 return result, "gemini"
             except Exception as e:
-                logger.warning(f"Gemini failed: {type(e).__name__}: {e}")
+                logger.warning(
+                    "Gemini failed (%s): %s: %s",
+                    getattr(e, "error_class", ErrorClass.PERMANENT).value, type(e).__name__, e
+                )
                 if not groq_available:
                     raise
         
@@ -250,10 +285,16 @@ class AIService:
         if groq_available:
             try:
                 logger.info("Attempting analysis with Groq (fallback)")
-                result = await self.groq.analyze(resume_text, job_description)
+                result = await self.retries.call(
+                    "groq",
+                    lambda: self.groq.analyze(resume_text, job_description)
+                )
                 return result, "groq"
             except Exception as e:
-                logger.error(f"Groq also failed: {type(e).__name__}: {e}")
+                logger.error(
+                    "Groq also failed (%s): %s: %s",
+                    getattr(e, "error_class", ErrorClass.PERMANENT).value, type(e).__name__, e
+                )
                 raise
         
         raise ValueError("All AI services failed.")
@@ -27,7 +27,7 @@ class ParserService:
             
             return "\n\n".join(text_parts)
         except Exception as e:
-            logger.warning(f"pdfplumber failed, trying PyPDF2: {e}")
+            logger.warning("pdfplumber failed, trying PyPDF2: %s", e)
             # Fallback to PyPDF2
             try:
                 from PyPDF2 import PdfReader
@@ -41,7 +41,7 @@ class ParserService:
                 
                 return "\n\n".join(text_parts)
             except Exception as e2:
-                logger.error(f"Both PDF parsers failed: {e2}")
+                logger.error("Both PDF parsers failed: %s", e2)
                 raise ValueError(f"Failed to parse PDF: {str(e2)}")
     
     @staticmethod
@@ -69,7 +69,7 @@ class ParserService:
             
             return "\n".join(text_parts)
         except Exception as e:
-            logger.error(f"DOCX parsing failed: {e}")
+            logger.error("DOCX parsing failed: %s", e)
             raise ValueError(f"Failed to parse DOCX: {str(e)}")
     
     @staticmethod
@@ -86,7 +86,7 @@ class ParserService:
             # Last resort: decode with errors ignored
             return content.decode('utf-8', errors='ignore')
         except Exception as e:
-            logger.error(f"TXT parsing failed: {e}")
+            logger.error("TXT parsing failed: %s", e)
             raise ValueError(f"Failed to parse TXT: {str(e)}")
     
     @classmethod
@@ -0,0 +1,256 @@
+"""
+Error classification and retry policies for AI providers
+"""
+import os
+import time
+import random
+import asyncio
+import logging
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+RETRY_BUDGET_RATIO = float(os.getenv("RETRY_BUDGET_RATIO", "0.2"))  # Retry tokens earned per request
+RETRY_BUDGET_MAX_TOKENS = float(os.getenv("RETRY_BUDGET_MAX_TOKENS", "10"))
+
+
+class ErrorClass(str, Enum):
+    """Taxonomy of provider failures"""
+    PERMANENT = "permanent"
+    RATE_LIMITED = "rate_limited"
+    TRANSIENT = "transient"
+    MALFORMED_OUTPUT = "malformed_output"
+
+
+class MalformedOutputError(ValueError):
+    """Provider answered, but the output could not be parsed"""
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How to retry one class of error on the same provider"""
+    max_retries: int
+    base_delay: float = 0.0
+    max_delay: float = 0.0
+    honor_retry_after: bool = False
+
+    def backoff(self, retry_number: int) -> float:
+        """Exponential backoff with full jitter"""
+        if self.base_delay <= 0:
+            return 0.0
+        ceiling = min(self.max_delay, self.base_delay * (2 ** retry_number))
+        return random.uniform(0, ceiling)
+
+
+DEFAULT_POLICIES: Dict[ErrorClass, RetryPolicy] = {
+    ErrorClass.PERMANENT: RetryPolicy(max_retries=0),
+    ErrorClass.RATE_LIMITED: RetryPolicy(max_retries=2, base_delay=1.0, max_delay=10.0, honor_retry_after=True),
+    ErrorClass.TRANSIENT: RetryPolicy(max_retries=2, base_delay=0.5, max_delay=5.0, honor_retry_after=True),
+    ErrorClass.MALFORMED_OUTPUT: RetryPolicy(max_retries=1),
+}
+
+_TRANSIENT_NAMES = ("timeout", "connection", "unavailable", "deadlineexceeded", "internalservererror")
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    """Extract an HTTP status code from provider SDK exceptions"""
+    for attr in ("status_code", "code"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(exc, "response", None)
+    value = getattr(response, "status_code", None)
+    return value if isinstance(value, int) else None
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    """Read a Retry-After header (seconds or HTTP-date) from the exception's response"""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_error(exc: BaseException) -> Tuple[ErrorClass, Optional[float]]:
+    """
+    Classify a provider exception
+
+    Returns:
+        Tuple of (error_class, retry_after_seconds)
+    """
+    if isinstance(exc, MalformedOutputError):
+        return ErrorClass.MALFORMED_OUTPUT, None
+
+    status_code = _status_code(exc)
+    if status_code == 429:
+        return ErrorClass.RATE_LIMITED, _retry_after(exc)
+    if status_code is not None and (status_code == 408 or status_code >= 500):
+        return ErrorClass.TRANSIENT, _retry_after(exc)
+    if status_code is not None and 400 <= status_code < 500:
+        return ErrorClass.PERMANENT, None
+
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return ErrorClass.TRANSIENT, None
+    name = type(exc).__name__.lower()
+    if any(marker in name for marker in _TRANSIENT_NAMES):
+        return ErrorClass.TRANSIENT, None
+    if "ratelimit" in name or "resourceexhausted" in name:
+        return ErrorClass.RATE_LIMITED, _retry_after(exc)
+
+    # Unknown errors are not retried on the same provider
+    return ErrorClass.PERMANENT, None
+
+
+class RetryBudget:
+    """
+    Token bucket shared by all providers
+
+    Every request deposits ``ratio`` tokens and every retry spends one,
+    so retries stay a bounded fraction of traffic during an outage.
+    Thread-safe, so worker threads (e.g. the bulk CLI) can share it.
+    """
+
+    def __init__(self, ratio: float = RETRY_BUDGET_RATIO, max_tokens: float = RETRY_BUDGET_MAX_TOKENS):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+@dataclass
+class ProviderRetryStats:
+    """Retry counters for a single provider"""
+    calls: int = 0
+    successes: int = 0
+    failures: int = 0
+    retries: int = 0
+    budget_exhausted: int = 0
+    errors_by_class: Counter = field(default_factory=Counter)
+    retries_by_class: Counter = field(default_factory=Counter)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "successes": self.successes,
+            "failures": self.failures,
+            "retries": self.retries,
+            "budget_exhausted": self.budget_exhausted,
+            "errors_by_class": dict(self.errors_by_class),
+            "retries_by_class": dict(self.retries_by_class),
+        }
+
+
+class RetryExecutor:
+    """
+    Run provider calls under per-error-class retry policies and a global budget
+
+    Counters are updated under a lock so one executor can be shared by
+    event loops running in several threads.
+    """
+
+    def __init__(
+        self,
+        policies: Optional[Dict[ErrorClass, RetryPolicy]] = None,
+        budget: Optional[RetryBudget] = None,
+    ):
+        self.policies = policies or DEFAULT_POLICIES
+        self.budget = budget or RetryBudget()
+        self.stats: Dict[str, ProviderRetryStats] = {}
+        self._lock = threading.Lock()
+
+    def _count(self, stats: ProviderRetryStats, *counters: str, error_class: Optional[str] = None,
+               retried: bool = False) -> None:
+        with self._lock:
+            for counter in counters:
+                setattr(stats, counter, getattr(stats, counter) + 1)
+            if error_class is not None:
+                stats.errors_by_class[error_class] += 1
+                if retried:
+                    stats.retries_by_class[error_class] += 1
+
+    def record_request(self) -> None:
+        """Credit the retry budget for one incoming request"""
+        self.budget.record_request()
+
+    async def call(self, provider: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Call ``func`` and retry it on the same provider according to policy
+
+        The final exception is re-raised with an ``error_class`` attribute
+        so callers can decide whether to fall back.
+        """
+        with self._lock:
+            stats = self.stats.setdefault(provider, ProviderRetryStats())
+        retry_number = 0
+        while True:
+            self._count(stats, "calls")
+            try:
+                result = await func()
+            except Exception as e:
+                error_class, retry_after = classify_error(e)
+                e.error_class = error_class
+                policy = self.policies[error_class]
+
+                if retry_number >= policy.max_retries:
+                    self._count(stats, "failures", error_class=error_class.value)
+                    raise
+
+                delay = policy.backoff(retry_number)
+                if retry_after is not None and policy.honor_retry_after:
+                    if retry_after > policy.max_delay:
+                        # Provider asks us to wait longer than we're willing to; fall back instead
+                        self._count(stats, "failures", error_class=error_class.value)
+                        raise
+                    delay = max(delay, retry_after)
+
+                if not self.budget.try_spend():
+                    self._count(stats, "budget_exhausted", "failures", error_class=error_class.value)
+                    logger.warning("%s retry budget exhausted after %s error", provider, error_class.value)
+                    raise
+
+                retry_number += 1
+                self._count(stats, "retries", error_class=error_class.value, retried=True)
+                logger.warning(
+                    "%s %s error (%s: %s); retry %s in %.2fs",
+                    provider, error_class.value, type(e).__name__, e, retry_number, delay
+                )
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            else:
+                self._count(stats, "successes")
+                return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-provider retry counters plus the remaining global budget"""
+        with self._lock:
+            return {
+                "budget_tokens": round(self.budget.tokens, 2),
+                "providers": {name: stats.to_dict() for name, stats in self.stats.items()},
+            }
@@ -0,0 +1,215 @@
+"""
+Non-blocking structured logging with request correlation and sampling
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import queue
+import random
+import copy
+import atexit
+import logging
+import logging.handlers
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, Iterator, Optional
+
+# Configuration
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()  # json or text
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))  # Share of requests whose INFO lines are kept
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s"
+
+# Loggers with their own handlers and propagate=False (uvicorn's dictConfig);
+# they are routed through the queue too so the access line isn't written on the loop
+ROUTED_LOGGERS = ("", "uvicorn", "uvicorn.access")
+
+# Per-request context, propagated across awaits by contextvars
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+sampled_var: ContextVar[bool] = ContextVar("sampled", default=True)
+stage_durations_var: ContextVar[Optional[Dict[str, float]]] = ContextVar("stage_durations", default=None)
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.Handler] = None
+_previous_handlers: Dict[str, list] = {}
+_atexit_registered = False
+
+
+class RequestContextFilter(logging.Filter):
+    """
+    Attach the request ID to each record and drop sub-WARNING records
+    of unsampled requests.
+
+    Runs on the QueueHandler, i.e. in the thread that emitted the record,
+    so the request's context variables are still visible.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        if record.levelno < logging.WARNING and not sampled_var.get():
+            return False
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Render log records as single-line JSON objects"""
+
+    # Extra attributes copied into the JSON payload when present
+    EXTRA_FIELDS = ("durations_ms", "status_code", "method", "path", "model_used", "ats_score")
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+        }
+        for field in self.EXTRA_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                payload[field] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that keeps exc_info for the listener's formatter
+
+    The stock ``prepare()`` formats the traceback into ``msg`` on the
+    calling thread and clears ``exc_info``. Here only the message is
+    interpolated; traceback and JSON rendering are left to the listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def _stream_handler() -> logging.Handler:
+    handler = logging.StreamHandler(sys.stderr)
+    if LOG_FORMAT == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    return handler
+
+
+def setup_logging() -> logging.handlers.QueueListener:
+    """
+    Route all logging through a queue drained by a background thread
+
+    The event loop only interpolates the message and enqueues the record;
+    JSON/traceback rendering and stream I/O happen on the listener thread.
+    Safe to call repeatedly, including after ``shutdown_logging()``.
+    """
+    global _listener, _queue_handler, _previous_handlers, _atexit_registered
+    if _listener is not None:
+        return _listener
+
+    stream_handler = _stream_handler()
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _queue_handler = StructuredQueueHandler(log_queue)
+    _queue_handler.addFilter(RequestContextFilter())
+
+    _previous_handlers = {}
+    for name in ROUTED_LOGGERS:
+        target = logging.getLogger(name)
+        if name and not target.handlers:
+            # Not configured (e.g. outside uvicorn): records reach the root queue via propagation
+            continue
+        _previous_handlers[name] = list(target.handlers)
+        for handler in _previous_handlers[name]:
+            target.removeHandler(handler)
+        target.addHandler(_queue_handler)
+    logging.getLogger().setLevel(LOG_LEVEL)
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, stream_handler, respect_handler_level=True
+    )
+    _listener.start()
+    if not _atexit_registered:
+        atexit.register(shutdown_logging)
+        _atexit_registered = True
+    return _listener
+
+
+def shutdown_logging() -> None:
+    """
+    Flush queued records, stop the listener thread and restore the routed
+    loggers' previous handlers so later records aren't queued into the void
+    """
+    global _listener, _queue_handler, _previous_handlers
+    if _listener is None:
+        return
+    for name, handlers in _previous_handlers.items():
+        target = logging.getLogger(name)
+        target.removeHandler(_queue_handler)
+        for handler in handlers:
+            target.addHandler(handler)
+    _listener.stop()
+    _listener = None
+    _queue_handler = None
+    _previous_handlers = {}
+
+
+def setup_worker_logging() -> None:
+    """
+    Log straight to stderr in a forked worker process
+
+    A child forked after ``setup_logging()`` inherits the queue handler but
+    not the listener thread, so its records would be queued and never written.
+    Meant as a process pool ``initializer``.
+    """
+    global _listener, _queue_handler, _previous_handlers
+    for name in ROUTED_LOGGERS:
+        target = logging.getLogger(name)
+        for handler in list(target.handlers):
+            target.removeHandler(handler)
+    _listener = None
+    _queue_handler = None
+    _previous_handlers = {}
+
+    handler = _stream_handler()
+    handler.addFilter(RequestContextFilter())
+    root = logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel(LOG_LEVEL)
+
+
+def start_request(request_id: Optional[str] = None) -> str:
+    """
+    Initialise logging context for a new request
+
+    Returns the request ID in use (the incoming one or a fresh one).
+    """
+    request_id = request_id or uuid.uuid4().hex
+    request_id_var.set(request_id)
+    sampled_var.set(LOG_SAMPLE_RATE >= 1.0 or random.random() < LOG_SAMPLE_RATE)
+    stage_durations_var.set({})
+    return request_id
+
+
+def get_stage_durations() -> Dict[str, float]:
+    """Return the stage durations (milliseconds) recorded for this request"""
+    return dict(stage_durations_var.get() or {})
+
+
+@contextmanager
+def timed_stage(name: str) -> Iterator[None]:
+    """Record the wall-clock duration of a request stage in milliseconds"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        durations = stage_durations_var.get()
+        if durations is not None:
+            durations[name] = round((time.perf_counter() - start) * 1000, 2)
@@ -0,0 +1,178 @@
+"""
+Opt-in sampling profiler producing flamegraph-compatible collapsed stacks
+"""
+import os
+import sys
+import hmac
+import time
+import logging
+import threading
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN", "")
+PROFILING_INTERVAL = float(os.getenv("PROFILING_INTERVAL", "0.005"))  # Seconds between samples
+PROFILING_MAX_SECONDS = int(os.getenv("PROFILING_MAX_SECONDS", 60))
+PROFILE_DIR = os.getenv("PROFILE_DIR", "")  # Also write profiles here when set
+MAX_STORED_PROFILES = 50
+
+if PROFILING_ENABLED and not PROFILING_TOKEN:
+    logger.warning("PROFILING_ENABLED is set but PROFILING_TOKEN is empty; profiling stays disabled")
+
+# Profiling is only reachable with a token configured
+PROFILING_AVAILABLE = PROFILING_ENABLED and bool(PROFILING_TOKEN)
+
+# Only one sampler may run at a time: each one takes the GIL every interval
+_sampler_slot = threading.Lock()
+
+# Request bookkeeping (event loop thread only) used to report profile overlap
+_inflight_requests = 0
+_active_profilers: Set["SamplingProfiler"] = set()
+
+
+class ProfilerBusyError(RuntimeError):
+    """Another profile is already being collected"""
+
+
+def is_authorized(token: Optional[str]) -> bool:
+    """Check whether a caller may trigger profiling"""
+    if not PROFILING_AVAILABLE:
+        return False
+    return bool(token) and hmac.compare_digest(token, PROFILING_TOKEN)
+
+
+@contextmanager
+def track_request() -> Iterator[None]:
+    """Count in-flight requests so request profiles can report overlap"""
+    global _inflight_requests
+    _inflight_requests += 1
+    for profiler in _active_profilers:
+        profiler.overlapping_requests += 1
+    try:
+        yield
+    finally:
+        _inflight_requests -= 1
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Background-thread stack sampler
+
+    Periodically captures the stacks of one thread (or all threads) via
+    ``sys._current_frames`` and aggregates them in the collapsed-stack
+    format understood by flamegraph.pl and speedscope. The event loop
+    thread is never paused beyond the GIL switch for each sample.
+
+    Sampling one thread captures everything that thread runs: for the
+    event loop thread that includes any request handled concurrently.
+    ``overlapping_requests`` counts those so the profile can be read
+    accordingly, and ``label`` is added as the root frame of every stack.
+    """
+
+    def __init__(
+        self,
+        thread_id: Optional[int] = None,
+        interval: float = PROFILING_INTERVAL,
+        label: Optional[str] = None,
+    ):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.label = label
+        self.samples: Counter = Counter()
+        self.duration = 0.0
+        self.overlapping_requests = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started_at = 0.0
+
+    def _sample(self) -> None:
+        own_id = threading.get_ident()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            if self.thread_id is not None and thread_id != self.thread_id:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if self.thread_id is None:
+                stack.append(f"thread {names.get(thread_id, thread_id)}")
+            if self.label:
+                stack.append(self.label)
+            self.samples[";".join(reversed(stack))] += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self) -> "SamplingProfiler":
+        """Start sampling; raises ProfilerBusyError if another profile is running"""
+        if not _sampler_slot.acquire(blocking=False):
+            raise ProfilerBusyError("A profile is already being collected")
+        # Requests already in flight (other than the caller's) overlap this profile
+        self.overlapping_requests = max(0, _inflight_requests - 1)
+        _active_profilers.add(self)
+        self._started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> "SamplingProfiler":
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+            self.duration = time.perf_counter() - self._started_at
+            _active_profilers.discard(self)
+            _sampler_slot.release()
+        return self
+
+    def __enter__(self) -> "SamplingProfiler":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def collapsed(self) -> str:
+        """Render samples as 'frame;frame;frame count' lines"""
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common()) + "\n"
+
+
+class ProfileStore:
+    """Keep the most recent request profiles in memory (and optionally on disk)"""
+
+    def __init__(self, max_entries: int = MAX_STORED_PROFILES):
+        self.max_entries = max_entries
+        self._profiles: "OrderedDict[str, str]" = OrderedDict()
+
+    def put(self, profile_id: str, collapsed: str) -> None:
+        self._profiles[profile_id] = collapsed
+        while len(self._profiles) > self.max_entries:
+            self._profiles.popitem(last=False)
+        if PROFILE_DIR:
+            try:
+                path = Path(PROFILE_DIR) / f"{profile_id}.collapsed"
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(collapsed, encoding="utf-8")
+            except OSError as e:
+                logger.warning("Could not write profile %s: %s", profile_id, e)
+
+    def get(self, profile_id: str) -> Optional[str]:
+        return self._profiles.get(profile_id)
+
+
+# Singleton instance
+profile_store = ProfileStore()
@@ -0,0 +1,67 @@
+"""
+Fast response serialization helpers
+"""
+import os
+import logging
+from functools import lru_cache
+from typing import Any, Type
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+FAST_SERIALIZATION = os.getenv("FAST_SERIALIZATION", "true").lower() == "true"
+RESPONSE_COMPRESSION = os.getenv("RESPONSE_COMPRESSION", "none").lower()  # none, gzip or br
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))
+
+
+@lru_cache(maxsize=None)
+def get_adapter(model: Type[Any]) -> TypeAdapter:
+    """Build (once) and return the TypeAdapter for a model"""
+    return TypeAdapter(model)
+
+
+def validate(model: Type[Any], data: Any) -> Any:
+    """Validate raw data into ``model`` in a single pass"""
+    return get_adapter(model).validate_python(data)
+
+
+def dump_json(model: Type[Any], instance: Any, **kwargs: Any) -> bytes:
+    """Serialize a validated instance straight to JSON bytes (no re-validation)"""
+    return get_adapter(model).dump_json(instance, **kwargs)
+
+
+class RawJSONResponse(Response):
+    """Response for pre-serialized JSON bytes; skips FastAPI's response_model pass"""
+    media_type = "application/json"
+
+
+def default_response_class() -> Type[JSONResponse]:
+    """orjson-backed JSONResponse when orjson is installed, stdlib otherwise"""
+    if not FAST_SERIALIZATION:
+        return JSONResponse
+    try:
+        import orjson  # noqa: F401
+        from fastapi.responses import ORJSONResponse
+        return ORJSONResponse
+    except ImportError:
+        logger.info("orjson not installed, using stdlib JSON responses")
+        return JSONResponse
+
+
+def add_compression(app) -> None:
+    """Enable gzip or brotli compression of large responses, if configured"""
+    if RESPONSE_COMPRESSION == "br":
+        try:
+            from brotli_asgi import BrotliMiddleware
+            # Falls back to gzip for clients that don't accept br
+            app.add_middleware(BrotliMiddleware, minimum_size=COMPRESSION_MIN_SIZE)
+            return
+        except ImportError:
+            logger.warning("brotli-asgi not installed, falling back to gzip compression")
+    if RESPONSE_COMPRESSION in ("gzip", "br"):
+        from fastapi.middleware.gzip import GZipMiddleware
+        app.add_middleware(GZipMiddleware, minimum_size=COMPRESSION_MIN_SIZE)
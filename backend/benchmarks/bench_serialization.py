@@ -0,0 +1,116 @@
+"""
+Micro-benchmark: old vs current /api/analyze response path
+
+Both paths cover everything the route does after the AI call: building the
+response, deriving the analysis ID, producing the stored body and rendering
+the HTTP response. The store write itself is identical in both and left out.
+
+Run from the backend directory:
+    python -m benchmarks.bench_serialization [--skills 40] [--number 2000]
+"""
+import sys
+import json
+import argparse
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from app.models.schemas import AnalyzeResponse
+from app.services.analysis_store import AnalysisStore
+from app.utils.serialization import validate, dump_json, RawJSONResponse
+
+RESPONSE_FIELD = create_response_field(name="Response_analyze_resume", type_=AnalyzeResponse)
+
+
+def make_result(skills: int) -> dict:
+    """Build a raw AI result shaped like a large roadmap"""
+    def skill(i: int, priority: str) -> dict:
+        return {
+            "skill": f"Skill {i}",
+            "priority": priority,
+            "timeline": "2-4 weeks",
+            "resources": [f"https://example.com/course/{i}/{j}" for j in range(4)],
+            "projects": [f"Build a project demonstrating skill {i} ({j})" for j in range(3)],
+        }
+
+    return {
+        "ats_score": 72,
+        "keyword_match_rate": 64,
+        "analysis": {
+            "strengths": [f"Strength {i}" for i in range(10)],
+            "weaknesses": [f"Weakness {i}" for i in range(10)],
+            "missing_keywords": [f"keyword{i}" for i in range(30)],
+            "section_scores": {
+                "contact_info": 90, "summary": 70, "experience": 75, "skills": 60,
+                "education": 80, "certifications": 40, "achievements": 55,
+            },
+            "format_score": 85,
+        },
+        "skill_roadmap": {
+            "critical_skills": [skill(i, "High") for i in range(skills)],
+            "recommended_skills": [skill(i, "Medium") for i in range(skills)],
+            "beneficial_skills": [skill(i, "Low") for i in range(skills)],
+            "timeline_overview": "3-6 months",
+        },
+        "recommendations": [f"Recommendation {i}" for i in range(10)],
+        "model_used": "groq",
+    }
+
+
+def _run(coro):
+    """Drive a coroutine that never suspends (FastAPI's serialize_response)"""
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    raise RuntimeError("coroutine suspended")
+
+
+def old_path(result: dict) -> bytes:
+    """Model construction, canonical-JSON ID, model_dump_json body, response_model pass"""
+    response = AnalyzeResponse(**result)
+    canonical = json.dumps(
+        response.model_dump(mode="json", exclude={"analysis_id"}),
+        sort_keys=True, separators=(",", ":"), ensure_ascii=False,
+    )
+    response.analysis_id = AnalysisStore.compute_id(canonical.encode("utf-8"))
+    response.model_dump_json().encode("utf-8")  # stored body
+    content = _run(serialize_response(field=RESPONSE_FIELD, response_content=response))
+    return JSONResponse(content=content).body
+
+
+def current_path(result: dict) -> bytes:
+    """Single TypeAdapter validation and a single dump, ID spliced into the bytes"""
+    response = validate(AnalyzeResponse, result)
+    analysis_id, body = AnalysisStore.attach_id(dump_json(AnalyzeResponse, response))
+    response.analysis_id = analysis_id
+    return RawJSONResponse(content=body).body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--skills", type=int, default=20, help="Skills per roadmap tier")
+    parser.add_argument("--number", type=int, default=1000, help="Iterations per path")
+    args = parser.parse_args()
+
+    result = make_result(args.skills)
+    old, current = json.loads(old_path(result)), json.loads(current_path(result))
+    old.pop("analysis_id"), current.pop("analysis_id")
+    assert old == current
+
+    size = len(current_path(result))
+    print(f"Payload: {size / 1024:.1f} KiB, {args.number} iterations")
+    timings = {}
+    for name, func in (("old", old_path), ("current", current_path)):
+        seconds = min(timeit.repeat(lambda: func(result), number=args.number, repeat=3))
+        timings[name] = seconds
+        print(f"{name:>8}: {seconds / args.number * 1e6:9.1f} us/op")
+    print(f" speedup: {timings['old'] / timings['current']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Tests for the analysis store and conditional GET helpers
+"""
+import asyncio
+
+import pytest
+
+from app.services.analysis_store import AnalysisStore, FileBackend, etag_matches
+
+ANALYSIS_ID = "0123456789abcdef0123456789abcdef"
+
+
+def test_etag_matches():
+    etag = f'"{ANALYSIS_ID}"'
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", {etag}', etag)
+    assert etag_matches(f"W/{etag}", etag)
+    assert etag_matches(etag, f"W/{etag}")
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('"other"', etag)
+
+
+def test_lru_eviction():
+    store = AnalysisStore(max_entries=2, weak_etags=False)
+    ids = [f"{i:032x}" for i in range(3)]
+    for analysis_id in ids:
+        asyncio.run(store.put(analysis_id, b"{}"))
+    assert asyncio.run(store.get(ids[0])) is None
+    assert asyncio.run(store.get(ids[2])).etag == f'"{ids[2]}"'
+
+
+def test_shared_backend_serves_other_instances(tmp_path):
+    writer = AnalysisStore(backend=FileBackend(str(tmp_path)))
+    reader = AnalysisStore(backend=FileBackend(str(tmp_path)))
+    asyncio.run(writer.put(ANALYSIS_ID, b'{"ats_score": 70}'))
+
+    stored = asyncio.run(reader.get(ANALYSIS_ID))
+    assert stored.body == b'{"ats_score": 70}'
+
+
+def test_rejects_malformed_ids(tmp_path):
+    store = AnalysisStore(backend=FileBackend(str(tmp_path)))
+    assert asyncio.run(store.get("../../etc/passwd")) is None
+
+
+def test_weak_etag_when_compression_enabled():
+    store = AnalysisStore(weak_etags=True)
+    stored = asyncio.run(store.put(ANALYSIS_ID, b"{}"))
+    assert stored.etag == f'W/"{ANALYSIS_ID}"'
+    assert etag_matches(f'"{ANALYSIS_ID}"', stored.etag)
+
+
+def test_attach_id_splices_into_single_dump():
+    from app.models.schemas import AnalyzeResponse
+    from app.utils.serialization import dump_json, validate
+
+    response = validate(AnalyzeResponse, {
+        "ats_score": 70, "keyword_match_rate": 60, "analysis": {}, "skill_roadmap": {},
+    })
+    analysis_id, body = AnalysisStore.attach_id(dump_json(AnalyzeResponse, response))
+
+    response.analysis_id = analysis_id
+    assert body == dump_json(AnalyzeResponse, response)
+    with pytest.raises(ValueError):
+        AnalysisStore.attach_id(body)
@@ -0,0 +1,168 @@
+"""
+Tests for the bulk analysis CLI: checkpointing, resume and output dedupe
+"""
+import json
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from app import cli
+from app.utils.logging_config import setup_logging, setup_worker_logging, shutdown_logging
+
+RESULT = {
+    "ats_score": 70,
+    "keyword_match_rate": 60,
+    "analysis": {},
+    "skill_roadmap": {},
+    "recommendations": ["Add metrics"],
+}
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    resumes = tmp_path / "resumes"
+    jds = tmp_path / "jds"
+    resumes.mkdir()
+    jds.mkdir()
+    for name in ("alice", "bob"):
+        (resumes / f"{name}.txt").write_text(f"{name} resume " + "python fastapi docker " * 10)
+    (jds / "backend.txt").write_text("Backend engineer with python experience " * 5)
+    return tmp_path
+
+
+@pytest.fixture
+def fake_analyze(monkeypatch):
+    """Replace provider calls; resumes listed in ``failing`` raise"""
+    calls = []
+    failing = set()
+
+    def analyze(resume_text, job_description):
+        calls.append(resume_text.split()[0])
+        if resume_text.split()[0] in failing:
+            raise RuntimeError("provider down")
+        return RESULT, "groq"
+
+    monkeypatch.setattr(cli, "_analyze_blocking", analyze)
+    return calls, failing
+
+
+def run_cli(corpus, fmt="jsonl"):
+    output = corpus / f"results.{fmt}"
+    cli.main([
+        "--resumes", str(corpus / "resumes"),
+        "--jds", str(corpus / "jds"),
+        "--output", str(output),
+        "--format", fmt,
+        "--parse-workers", "1",
+    ])
+    return output
+
+
+def read_jsonl(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_resume_skips_completed_and_replaces_failed_rows(corpus, fake_analyze):
+    calls, failing = fake_analyze
+    failing.add("bob")
+    output = run_cli(corpus)
+
+    rows = read_jsonl(output)
+    assert sorted((r["pair_id"], r["status"]) for r in rows) == [
+        ("alice.txt::backend.txt", "ok"),
+        ("bob.txt::backend.txt", "error"),
+    ]
+    assert (corpus / "results.jsonl.checkpoint").read_text().split() == ["alice.txt::backend.txt"]
+
+    calls.clear()
+    failing.clear()
+    run_cli(corpus)
+
+    assert calls == ["bob"]
+    rows = read_jsonl(output)
+    assert sorted((r["pair_id"], r["status"]) for r in rows) == [
+        ("alice.txt::backend.txt", "ok"),
+        ("bob.txt::backend.txt", "ok"),
+    ]
+
+
+def test_row_without_checkpoint_is_redone_once(corpus, fake_analyze):
+    calls, _ = fake_analyze
+    output = run_cli(corpus)
+
+    # Simulate a crash after writing bob's row but before checkpointing it
+    (corpus / "results.jsonl.checkpoint").write_text("alice.txt::backend.txt\n")
+    calls.clear()
+    run_cli(corpus)
+
+    assert calls == ["bob"]
+    assert sorted(r["pair_id"] for r in read_jsonl(output)) == [
+        "alice.txt::backend.txt",
+        "bob.txt::backend.txt",
+    ]
+
+
+def test_parquet_parts_and_checkpoint(corpus, fake_analyze, monkeypatch):
+    pq = pytest.importorskip("pyarrow.parquet")
+    calls, failing = fake_analyze
+    monkeypatch.setattr(cli.ResultWriter, "PARQUET_BATCH_SIZE", 1)
+    failing.add("bob")
+    run_cli(corpus, fmt="parquet")
+
+    parts = sorted(corpus.glob("results.part*.parquet"))
+    assert len(parts) == 2
+    assert (corpus / "results.parquet.checkpoint").read_text().split() == ["alice.txt::backend.txt"]
+
+    failing.clear()
+    calls.clear()
+    run_cli(corpus, fmt="parquet")
+
+    assert calls == ["bob"]
+    rows = [row for part in sorted(corpus.glob("results.part*.parquet")) for row in pq.read_table(part).to_pylist()]
+    assert sorted((r["pair_id"], r["status"]) for r in rows) == [
+        ("alice.txt::backend.txt", "ok"),
+        ("bob.txt::backend.txt", "ok"),
+    ]
+
+
+def test_manifest_ids_are_relative_paths(tmp_path):
+    for folder in ("team_a", "team_b"):
+        (tmp_path / folder).mkdir()
+        (tmp_path / folder / "resume.txt").write_text("resume")
+    (tmp_path / "jd.txt").write_text("jd")
+    manifest = tmp_path / "pairs.jsonl"
+    manifest.write_text("".join(
+        json.dumps({"resume": f"{folder}/resume.txt", "job_description": "jd.txt"}) + "\n"
+        for folder in ("team_a", "team_b")
+    ))
+
+    pairs = cli.load_pairs(cli.build_parser().parse_args(["--manifest", str(manifest), "--output", "out.jsonl"]))
+    assert [p.pair_id for p in pairs] == ["team_a/resume.txt::jd.txt", "team_b/resume.txt::jd.txt"]
+
+    manifest.write_text(manifest.read_text() + json.dumps(
+        {"resume": "team_a/resume.txt", "job_description": "jd.txt"}
+    ) + "\n")
+    with pytest.raises(SystemExit):
+        cli.main(["--manifest", str(manifest), "--output", str(tmp_path / "out.jsonl")])
+
+
+def _log_from_worker():
+    logging.getLogger("app.cli").warning("parsed in worker")
+
+
+def test_parse_workers_log_to_stderr(capfd):
+    if "fork" not in multiprocessing.get_all_start_methods():
+        pytest.skip("fork start method not available")
+    setup_logging()
+    try:
+        with ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=setup_worker_logging,
+        ) as pool:
+            pool.submit(_log_from_worker).result()
+    finally:
+        shutdown_logging()
+    assert "parsed in worker" in capfd.readouterr().err
@@ -0,0 +1,75 @@
+"""
+Tests for the queue-based logging pipeline
+"""
+import json
+import logging
+
+from app.utils import logging_config
+
+
+def _records(capsys):
+    return [json.loads(line) for line in capsys.readouterr().err.splitlines() if line.strip()]
+
+
+def test_exception_traceback_kept_out_of_message(capsys):
+    logging_config.shutdown_logging()
+    logging_config.setup_logging()
+    try:
+        1 / 0
+    except ZeroDivisionError:
+        logging.getLogger("test").exception("failed %s", "here")
+    logging_config.shutdown_logging()
+
+    [record] = _records(capsys)
+    assert record["message"] == "failed here"
+    assert "ZeroDivisionError" in record["exc_info"]
+
+
+def test_shutdown_restores_root_handlers_and_setup_restarts(capsys):
+    logging_config.shutdown_logging()
+    root = logging.getLogger()
+    before = list(root.handlers)
+
+    logging_config.setup_logging()
+    logging_config.shutdown_logging()
+    assert root.handlers == before
+
+    logging_config.setup_logging()
+    logging.getLogger("test").warning("after restart")
+    logging_config.shutdown_logging()
+    assert [r["message"] for r in _records(capsys)] == ["after restart"]
+
+
+def test_request_id_and_stage_durations(capsys):
+    logging_config.shutdown_logging()
+    logging_config.setup_logging()
+    logging_config.start_request("req-1")
+    with logging_config.timed_stage("parse"):
+        pass
+    logging.getLogger("test").info("done", extra={"durations_ms": logging_config.get_stage_durations()})
+    logging_config.shutdown_logging()
+
+    [record] = _records(capsys)
+    assert record["request_id"] == "req-1"
+    assert "parse" in record["durations_ms"]
+
+
+def test_uvicorn_loggers_routed_through_queue(capsys):
+    logging_config.shutdown_logging()
+    access = logging.getLogger("uvicorn.access")
+    original = logging.StreamHandler()
+    access.addHandler(original)
+    access.propagate = False
+    try:
+        logging_config.setup_logging()
+        assert original not in access.handlers
+        access.info('%s - "%s %s HTTP/%s" %d', "127.0.0.1", "GET", "/api/health", "1.1", 200)
+        logging_config.shutdown_logging()
+
+        assert access.handlers == [original]
+        [record] = _records(capsys)
+        assert record["logger"] == "uvicorn.access"
+        assert record["message"] == '127.0.0.1 - "GET /api/health HTTP/1.1" 200'
+    finally:
+        access.removeHandler(original)
+        access.propagate = True
@@ -0,0 +1,63 @@
+"""
+Tests for the sampling profiler and its access guard
+"""
+import threading
+import time
+
+import pytest
+
+from app.utils import profiling
+from app.utils.profiling import ProfilerBusyError, SamplingProfiler
+
+
+def _busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        sum(range(100))
+
+
+def test_collapsed_stacks_are_labelled():
+    with SamplingProfiler(thread_id=threading.get_ident(), interval=0.001, label="request abc") as profiler:
+        _busy(0.05)
+
+    lines = profiler.collapsed().strip().splitlines()
+    assert lines
+    assert all(line.startswith("request abc;") for line in lines)
+    assert any("_busy" in line for line in lines)
+
+
+def test_only_one_sampler_at_a_time():
+    with SamplingProfiler(interval=0.01):
+        with pytest.raises(ProfilerBusyError):
+            SamplingProfiler(interval=0.01).start()
+    # Slot is released once the first profile stops
+    SamplingProfiler(interval=0.01).start().stop()
+
+
+def test_overlapping_requests_counted():
+    with profiling.track_request():
+        with profiling.track_request():
+            profiler = SamplingProfiler(interval=0.01).start()
+            with profiling.track_request():
+                pass
+            profiler.stop()
+    assert profiler.overlapping_requests == 2
+
+
+def test_token_required(monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILING_AVAILABLE", False)
+    assert not profiling.is_authorized("anything")
+
+    monkeypatch.setattr(profiling, "PROFILING_AVAILABLE", True)
+    monkeypatch.setattr(profiling, "PROFILING_TOKEN", "secret")
+    assert profiling.is_authorized("secret")
+    assert not profiling.is_authorized("wrong")
+    assert not profiling.is_authorized(None)
+
+
+def test_middleware_not_registered_when_unavailable():
+    from app import main
+
+    assert not main.PROFILING_AVAILABLE
+    dispatches = [m.options.get("dispatch") for m in main.app.user_middleware]
+    assert main.profile_request not in dispatches
@@ -0,0 +1,176 @@
+"""
+Tests for provider error classification and retry policies
+"""
+import asyncio
+import time
+from email.utils import formatdate
+
+import pytest
+
+from app.services import retry_policy
+from app.services.retry_policy import (
+    ErrorClass,
+    MalformedOutputError,
+    RetryBudget,
+    RetryExecutor,
+    RetryPolicy,
+    classify_error,
+)
+
+
+class FakeResponse:
+    def __init__(self, headers=None):
+        self.headers = headers or {}
+
+
+class ProviderError(Exception):
+    """Mimics an SDK status error carrying the HTTP response"""
+
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = FakeResponse(headers)
+
+
+class NotFound(Exception):
+    """Mimics google.api_core exceptions, which expose the HTTP status as ``code``"""
+    code = 404
+
+
+class APITimeoutError(Exception):
+    pass
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record requested backoff delays instead of sleeping"""
+    recorded = []
+
+    async def fake_sleep(delay):
+        recorded.append(delay)
+
+    monkeypatch.setattr(retry_policy.asyncio, "sleep", fake_sleep)
+    return recorded
+
+
+def failing_then(errors, result="ok"):
+    errors = list(errors)
+
+    async def func():
+        if errors:
+            raise errors.pop(0)
+        return result
+
+    return func
+
+
+@pytest.mark.parametrize("exc, expected", [
+    (ProviderError(429), ErrorClass.RATE_LIMITED),
+    (ProviderError(503), ErrorClass.TRANSIENT),
+    (ProviderError(408), ErrorClass.TRANSIENT),
+    (ProviderError(400), ErrorClass.PERMANENT),
+    (NotFound("models/gemini-pro is not found"), ErrorClass.PERMANENT),
+    (MalformedOutputError("bad json"), ErrorClass.MALFORMED_OUTPUT),
+    (APITimeoutError(), ErrorClass.TRANSIENT),
+    (ConnectionError(), ErrorClass.TRANSIENT),
+    (RuntimeError("unknown"), ErrorClass.PERMANENT),
+])
+def test_classify_error(exc, expected):
+    assert classify_error(exc)[0] == expected
+
+
+def test_retry_after_seconds_and_http_date():
+    assert classify_error(ProviderError(429, {"retry-after": "3"}))[1] == 3.0
+
+    http_date = formatdate(time.time() + 30, usegmt=True)
+    _, retry_after = classify_error(ProviderError(503, {"retry-after": http_date}))
+    assert 25 < retry_after <= 30
+
+    assert classify_error(ProviderError(429, {"retry-after": "soon"}))[1] is None
+
+
+def test_retry_budget():
+    budget = RetryBudget(ratio=0.5, max_tokens=1)
+    assert budget.try_spend()
+    assert not budget.try_spend()
+    budget.record_request()
+    assert not budget.try_spend()
+    budget.record_request()
+    assert budget.try_spend()
+
+
+def test_transient_error_retried_and_counted(sleeps):
+    executor = RetryExecutor()
+    result = asyncio.run(executor.call("groq", failing_then([ProviderError(503), ProviderError(503)])))
+
+    assert result == "ok"
+    assert len(sleeps) == 2
+    stats = executor.get_stats()["providers"]["groq"]
+    assert stats["retries"] == 2
+    assert stats["retries_by_class"] == {"transient": 2}
+    assert stats["successes"] == 1
+
+
+def test_transient_error_honors_retry_after(sleeps):
+    executor = RetryExecutor()
+    asyncio.run(executor.call("groq", failing_then([ProviderError(503, {"retry-after": "2"})])))
+    assert sleeps[0] >= 2
+
+
+def test_permanent_error_not_retried(sleeps):
+    executor = RetryExecutor()
+    with pytest.raises(NotFound) as exc_info:
+        asyncio.run(executor.call("gemini", failing_then([NotFound()])))
+
+    assert exc_info.value.error_class == ErrorClass.PERMANENT
+    assert sleeps == []
+    assert executor.get_stats()["providers"]["gemini"]["retries"] == 0
+
+
+def test_retry_after_beyond_max_delay_gives_up(sleeps):
+    executor = RetryExecutor()
+    with pytest.raises(ProviderError):
+        asyncio.run(executor.call("groq", failing_then([ProviderError(429, {"retry-after": "60"})])))
+    assert sleeps == []
+
+
+def test_budget_exhaustion_stops_retries(sleeps):
+    policies = {error_class: RetryPolicy(max_retries=5) for error_class in ErrorClass}
+    executor = RetryExecutor(policies=policies, budget=RetryBudget(ratio=0, max_tokens=1))
+
+    with pytest.raises(ProviderError):
+        asyncio.run(executor.call("groq", failing_then([ProviderError(503)] * 5)))
+
+    stats = executor.get_stats()["providers"]["groq"]
+    assert stats["retries"] == 1
+    assert stats["budget_exhausted"] == 1
+
+
+def test_gemini_service_unavailable_retried_only_by_executor(monkeypatch, sleeps):
+    """The SDK's own ServiceUnavailable retry must be off: 1 + max_retries calls"""
+    from google.api_core import exceptions as core_exceptions
+    from google.api_core import gapic_v1
+    from app.services.gemini_service import AIService
+
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.delenv("GROQ_API_KEY", raising=False)
+    service = AIService()
+
+    # Swap the transport's raw RPC for a failing fake, keeping the SDK's default retry
+    transport = service.gemini.model._client._client._transport
+    original = transport._wrapped_methods[transport.generate_content]
+    calls = []
+
+    def unavailable(request, **kwargs):
+        calls.append(request)
+        raise core_exceptions.ServiceUnavailable("backend overloaded")
+
+    transport._wrapped_methods[transport.generate_content] = gapic_v1.method.wrap_method(
+        unavailable, default_retry=original._retry, default_timeout=original._timeout
+    )
+
+    with pytest.raises(core_exceptions.ServiceUnavailable):
+        asyncio.run(service.analyze("resume text", "job description"))
+
+    assert len(calls) == 1 + retry_policy.DEFAULT_POLICIES[ErrorClass.TRANSIENT].max_retries
+    assert service.retries.get_stats()["providers"]["gemini"]["retries_by_class"] == {"transient": 2}
@@ -1,5 +1,21 @@
-import { useState, useCallback } from 'react';
-import { analyzeResume } from '../services/api';
+import { useState, useCallback, useEffect } from 'react';
+import { analyzeResume, getAnalysis } from '../services/api';
+
+const ANALYSIS_PARAM = 'analysis';
+
+/**
+ * Keep the current analysis ID in the URL so reloads and shared links
+ * are served by the cacheable GET endpoint instead of a new analysis
+ */
+const setAnalysisParam = (analysisId) => {
+    const url = new URL(window.location.href);
+    if (analysisId) {
+        url.searchParams.set(ANALYSIS_PARAM, analysisId);
+    } else {
+        url.searchParams.delete(ANALYSIS_PARAM);
+    }
+    window.history.replaceState(null, '', url);
+};
 
 /**
  * Hook for managing resume analysis state and actions
@@ -11,6 +27,18 @@ export function useAnalysis() {
     const [loading, setLoading] = useState(false);
     const [error, setError] = useState(null);
 
+    // Restore a previous analysis from the URL on first load
+    useEffect(() => {
+        const analysisId = new URLSearchParams(window.location.search).get(ANALYSIS_PARAM);
+        if (!analysisId) return;
+
+        setLoading(true);
+        getAnalysis(analysisId)
+            .then(setResults)
+            .catch(() => setAnalysisParam(null))
+            .finally(() => setLoading(false));
+    }, []);
+
     const analyze = useCallback(async () => {
         if (!file || !jobDescription.trim()) {
             setError('Please provide both a resume and job description');
@@ -24,6 +52,7 @@ export function useAnalysis() {
         try {
             const data = await analyzeResume(file, jobDescription);
             setResults(data);
+            setAnalysisParam(data.analysis_id);
         } catch (err) {
             setError(err.message || 'Analysis failed. Please try again.');
         } finally {
@@ -36,11 +65,13 @@ export function useAnalysis() {
         setJobDescription('');
         setResults(null);
         setError(null);
+        setAnalysisParam(null);
     }, []);
 
     const clearResults = useCallback(() => {
         setResults(null);
         setError(null);
+        setAnalysisParam(null);
     }, []);
 
     return {
@@ -68,6 +68,21 @@ export const analyzeResume = async (file, jobDescription) => {
     return response.json();
 };
 
+/**
+ * Fetch a previously completed analysis by its ID
+ * (responses are cacheable, so repeat views can be served by the browser/CDN)
+ */
+export const getAnalysis = async (analysisId) => {
+    const response = await fetch(`${API_BASE_URL}/analyses/${encodeURIComponent(analysisId)}`);
+
+    if (!response.ok) {
+        const errorData = await response.json().catch(() => ({}));
+        throw new Error(errorData.detail || `Failed to load analysis (status ${response.status})`);
+    }
+
+    return response.json();
+};
+
 /**
  * Health check for the API
  */